@@ -1 +1,2 @@
+from .cache import CacheBackend, LRUCache
 from .schema import GoldenSchema
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class CacheBackend(object):
+    """ Base class for storage backends used to cache serialized output.
+
+    Subclasses must implement `_get`, `set`, `clear` and `__len__`; hit
+    and miss bookkeeping is handled here, under its own lock, so every
+    backend reports the same statistics even when used from several
+    threads.
+    """
+
+    _MISSING = object()
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = Lock()
+
+    def get(self, key):
+        """ Return the value cached under `key`, or None on a miss. """
+        value = self._get(key, self._MISSING)
+        with self._stats_lock:
+            if value is self._MISSING:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return value
+
+    def _get(self, key, default):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def stats(self):
+        """ Return a dict of hit/miss counters and the current size. """
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': float(hits) / lookups if lookups else 0.0,
+            'size': len(self)
+        }
+
+
+class LRUCache(CacheBackend):
+    """ In-process CacheBackend that evicts the least recently used
+    entry once `max_size` entries are stored.
+    """
+
+    def __init__(self, max_size=1024):
+        """
+        Args:
+            max_size (int) - The maximum number of entries to keep
+        """
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+
+        super(LRUCache, self).__init__()
+
+        self.max_size = max_size
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def _get(self, key, default):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        stats = super(LRUCache, self).stats()
+        stats['evictions'] = self.evictions
+        stats['max_size'] = self.max_size
+        return stats
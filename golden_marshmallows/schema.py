@@ -1,7 +1,17 @@
 import re
+from copy import deepcopy
+from hashlib import sha1
+from itertools import chain, repeat
+
+from collections.abc import Mapping
 
 from marshmallow import (
-    fields, post_load, Schema, EXCLUDE)
+    fields, missing, post_load, Schema, ValidationError, EXCLUDE)
+from marshmallow.decorators import POST_LOAD, PRE_LOAD
+from marshmallow.error_store import ErrorStore
+from marshmallow.utils import is_collection
+from sqlalchemy import inspect
+from sqlalchemy.orm.state import InstanceState
 from sqlalchemy.ext.declarative.api import DeclarativeMeta
 from sqlalchemy.dialects.postgresql import (
     ARRAY as pgARRAY, BIGINT, ENUM, TIMESTAMP, UUID)
@@ -26,6 +36,25 @@ def snakecase(string):
     return snaked.lower()
 
 
+def _qualified_name(cls):
+    """ Return a class's dotted import path. """
+    return '{}.{}'.format(cls.__module__, cls.__name__)
+
+
+def _field_signature(field):
+    """ Describe a field's type, including inner and nested schemas,
+    for use in a GoldenSchema cache plan.
+    """
+    if isinstance(field, fields.Nested):
+        schema = field.schema
+        nested = getattr(schema, 'cache_plan', None) or \
+            _qualified_name(type(schema))
+        return ('Nested', nested, field.many or schema.many)
+    if isinstance(field, fields.List):
+        return ('List', _field_signature(field.inner))
+    return _qualified_name(type(field))
+
+
 class EnumField(fields.Method):
 
     def __init__(self, snake_to_camel=False, camel_to_snake=True, **kwargs):
@@ -131,7 +160,8 @@ class GoldenSchema(CaseChangingSchema):
     }
 
     def __init__(self, sqlalchemy_cls, nested_map=None, new_obj=False,
-                 unknown=EXCLUDE, *args, **kwargs):
+                 unknown=EXCLUDE, cache=None, version_col=None,
+                 polymorphic=False, *args, **kwargs):
         """ Introspects and creates fields for each attribute of the
         given SQLAlchemy class.
 
@@ -145,17 +175,42 @@ class GoldenSchema(CaseChangingSchema):
             new_obj (bool) - Whether this instance will be used to
                 deserialize to new objects; basically just skips adding
                 any field named 'id'
+            cache (CacheBackend) - Optional cache for serialized column
+                values, keyed by a hash of this schema's configuration
+                (its plan), the object's identity key and its version;
+                shared with auto-generated nested schemas
+            version_col (str) - Name of the attribute holding an
+                object's version (e.g. 'updated_at'); defaults to the
+                mapper's `version_id_col`. Objects without a version
+                are never cached
+            polymorphic (bool) - Whether to dispatch each object to a
+                schema for its mapped subclass, chosen by the object's
+                class on dump and by the discriminator field on load
         """
         nested_map = nested_map if nested_map is not None else {}
 
+        if (version_col is not None and
+                version_col not in sqlalchemy_cls.__mapper__.attrs):
+            raise ValueError(
+                '{} has no attribute {!r} to use as version_col'.format(
+                    sqlalchemy_cls.__name__, version_col))
+
         kwargs['unknown'] = unknown
 
         super(GoldenSchema, self).__init__(*args, **kwargs)
 
+        # Kept so polymorphic subclass schemas get the same settings
+        self._schema_kwargs = kwargs
+
         self.new_obj = new_obj
 
         self.sqlalchemy_cls = sqlalchemy_cls
 
+        self.cache = cache
+        self.version_col = version_col
+        self._nested_names = set()
+        self._column_names = set()
+
         # Introspect the correct field types from the SQLAlchemy class
         columns = sqlalchemy_cls.__mapper__.columns._data
 
@@ -165,6 +220,13 @@ class GoldenSchema(CaseChangingSchema):
         # Finally, add fields to Schema instance
         self.add_fields(fields)
 
+        self.cache_plan = self.build_cache_plan()
+
+        self.polymorphic_schemas = {}
+        self._polymorphic_classes = {}
+        if polymorphic:
+            self.generate_polymorphic_schemas(nested_map)
+
     def generate_nested_fields(self, nested_map, new_fields):
         """ Auto-generate `Nested` Marshmallow fields using a field-to-
         SQLAlchemy class map.
@@ -178,6 +240,15 @@ class GoldenSchema(CaseChangingSchema):
         """
         for key, val in nested_map.items():
             if isinstance(val['class'], DeclarativeMeta):
+                # An inherited version_col only applies to related classes
+                # that have it; otherwise fall back to `version_id_col`
+                if 'version_col' in val:
+                    version_col = val['version_col']
+                elif self.version_col in val['class'].__mapper__.attrs:
+                    version_col = self.version_col
+                else:
+                    version_col = None
+
                 schema = GoldenSchema(
                     val['class'],
                     nested_map=val.get('nested_map') or {},
@@ -185,7 +256,10 @@ class GoldenSchema(CaseChangingSchema):
                     camel_to_snake=self.camel_to_snake,
                     many=val['many'],
                     unknown=self.unknown,
-                    new_obj=self.new_obj)
+                    new_obj=self.new_obj,
+                    cache=self.cache,
+                    version_col=version_col,
+                    polymorphic=val.get('polymorphic', False))
             elif isinstance(val['class'], GoldenSchema):
                 schema = val['class']
             else:
@@ -197,6 +271,7 @@ class GoldenSchema(CaseChangingSchema):
                 many=val['many']
             )
             new_fields[key] = fieldtype
+            self._nested_names.add(key)
 
         return new_fields
 
@@ -249,6 +324,7 @@ class GoldenSchema(CaseChangingSchema):
             # allows subclasses of this class to still define custom
             # fields)
             if name not in self.declared_fields:
+                is_column = name not in self._nested_names
                 field.attribute = name
                 if self.snake_to_camel:
                     name = camelcase(name)
@@ -263,6 +339,353 @@ class GoldenSchema(CaseChangingSchema):
                 else:
                     self.dump_fields[name] = field
                     self.load_fields[name] = field
+                    if is_column:
+                        self._column_names.add(name)
+
+    def generate_polymorphic_schemas(self, nested_map):
+        """ Build a schema for every mapped subclass of the SQLAlchemy
+        class, keyed by polymorphic identity, so that mixed collections
+        can be dispatched per object with a single dict lookup.
+
+        Subclass schemas are instances of this schema's own class built
+        with the same settings, so any manually declared fields carry
+        over to them; they share this schema's `context`.
+        """
+        mapper = self.sqlalchemy_cls.__mapper__
+        if mapper.polymorphic_on is None:
+            raise ValueError(
+                '{} is not mapped polymorphically'.format(
+                    self.sqlalchemy_cls.__name__))
+
+        key = self._discriminator_attr = mapper.get_property_by_column(
+            mapper.polymorphic_on).key
+        if self.snake_to_camel:
+            key = camelcase(key)
+        elif self.camel_to_snake:
+            key = snakecase(key)
+        self.discriminator_key = self.fields[key].data_key or key
+
+        for identity, sub_mapper in mapper.polymorphic_map.items():
+            if not sub_mapper.isa(mapper):
+                continue
+            if sub_mapper is mapper:
+                schema = self
+            else:
+                # Objects are dispatched one at a time, so `many` is off
+                schema_kwargs = dict(
+                    self._schema_kwargs,
+                    many=False,
+                    nested_map=nested_map,
+                    new_obj=self.new_obj,
+                    cache=self.cache,
+                    version_col=self.version_col)
+                schema = type(self)(sub_mapper.class_, **schema_kwargs)
+                schema.context = self.context
+            self.polymorphic_schemas[identity] = schema
+            self._polymorphic_classes[sub_mapper.class_] = schema
+
+    def _do_load(self, data, many=None, partial=None, unknown=None,
+                 postprocess=True):
+        """ Deserialize or validate data, dispatching each item to the
+        subclass schema named by its discriminator field if this schema
+        is polymorphic.
+
+        Overriding this rather than `load` means `validate` checks the
+        same subclass fields that `load` would.
+        """
+        if not self.polymorphic_schemas:
+            return super(GoldenSchema, self)._do_load(
+                data, many=many, partial=partial, unknown=unknown,
+                postprocess=postprocess)
+
+        many = self.many if many is None else bool(many)
+        if not many:
+            return self._load_polymorphic(
+                data, partial, unknown, postprocess)
+
+        return self._load_polymorphic_many(
+            data, partial, unknown, postprocess)
+
+    def _polymorphic_schema_for_data(self, data):
+        """ Return the schema for a single item's polymorphic identity,
+        raising a ValidationError if there isn't one.
+        """
+        if not isinstance(data, Mapping):
+            raise ValidationError(
+                {'_schema': [self.error_messages['type']]}, data=data)
+
+        identity = data.get(self.discriminator_key)
+        schema = self.polymorphic_schemas.get(identity)
+        if schema is None:
+            raise ValidationError(
+                {self.discriminator_key: [
+                    'Unknown polymorphic identity: {!r}'.format(identity)]},
+                data=data)
+
+        schema.context = self.context
+        return schema
+
+    def _load_polymorphic(self, data, partial, unknown, postprocess):
+        """ Deserialize or validate a single item with the schema for
+        its polymorphic identity.
+        """
+        schema = self._polymorphic_schema_for_data(data)
+        if schema is self:
+            return super(GoldenSchema, self)._do_load(
+                data, many=False, partial=partial, unknown=unknown,
+                postprocess=postprocess)
+        return schema._do_load(
+            data, many=False, partial=partial, unknown=unknown,
+            postprocess=postprocess)
+
+    def _load_polymorphic_many(self, data, partial, unknown, postprocess):
+        """ Deserialize or validate a collection, dispatching each item
+        to the schema for its polymorphic identity.
+
+        Follows the same steps as `Schema._do_load`: this schema's
+        `pass_many` processors and validators see the whole collection,
+        while each item's own processors and validators run on its
+        subclass schema.
+        """
+        if partial is None:
+            partial = self.partial
+        if unknown is None:
+            unknown = self.unknown
+
+        error_store = ErrorStore()
+        result = None
+        try:
+            processed = self._invoke_processors(
+                PRE_LOAD, pass_many=True, data=data, many=True,
+                original_data=data, partial=partial)
+        except ValidationError as err:
+            error_store.store_error(err.normalized_messages())
+        else:
+            if not is_collection(processed):
+                error_store.store_error([self.error_messages['type']])
+            else:
+                originals = list(processed)
+                schemas, result = self._deserialize_polymorphic(
+                    originals, error_store, partial, unknown)
+                self._validate_polymorphic(
+                    data, originals, schemas, result, error_store, partial)
+
+                if not error_store.errors and postprocess:
+                    try:
+                        result = self._invoke_processors(
+                            POST_LOAD, pass_many=True, data=result,
+                            many=True, original_data=data, partial=partial)
+                        # The pass_many hooks may have added, dropped or
+                        # reordered items, so dispatch on the loaded
+                        # discriminator rather than position
+                        result = [
+                            self._schema_for_loaded(item)._invoke_processors(
+                                POST_LOAD, pass_many=False, data=item,
+                                many=False, original_data=original,
+                                partial=partial)
+                            for item, original in zip(
+                                result, chain(originals, repeat(None)))
+                        ]
+                    except ValidationError as err:
+                        error_store.store_error(err.normalized_messages())
+
+        if error_store.errors:
+            exc = ValidationError(
+                error_store.errors, data=data, valid_data=result)
+            self.handle_error(exc, data, many=True, partial=partial)
+            raise exc
+        return result
+
+    def _schema_for_loaded(self, item):
+        """ Return the schema for a deserialized item's polymorphic
+        identity, falling back to this schema.
+        """
+        if isinstance(item, Mapping):
+            identity = item.get(self._discriminator_attr)
+            return self.polymorphic_schemas.get(identity, self)
+        return self
+
+    def _polymorphic_schema_for_class(self, obj):
+        """ Find the schema for the nearest mapped ancestor of an
+        object's class that has one, and remember it for that class.
+        """
+        schema = self
+        state = inspect(obj, raiseerr=False)
+        if isinstance(state, InstanceState):
+            for mapper in state.mapper.iterate_to_root():
+                if mapper.class_ in self._polymorphic_classes:
+                    schema = self._polymorphic_classes[mapper.class_]
+                    break
+
+        self._polymorphic_classes[type(obj)] = schema
+        return schema
+
+    def _deserialize_polymorphic(self, items, error_store, partial,
+                                 unknown):
+        """ Run item-level pre-processing, deserialization and field
+        validation on each item's subclass schema.
+
+        Returns the schema used for each item (None if it had no valid
+        identity) and the deserialized items.
+        """
+        schemas = []
+        result = []
+        for index, item in enumerate(items):
+            schema = None
+            loaded = self.dict_class()
+            item_store = ErrorStore()
+            try:
+                schema = self._polymorphic_schema_for_data(item)
+                item = schema._invoke_processors(
+                    PRE_LOAD, pass_many=False, data=item, many=False,
+                    original_data=item, partial=partial)
+                loaded = schema._deserialize(
+                    item, error_store=item_store, many=False,
+                    partial=partial, unknown=unknown)
+                schema._invoke_field_validators(
+                    error_store=item_store, data=loaded, many=False)
+            except ValidationError as err:
+                schema = None
+                item_store.store_error(err.messages)
+
+            if item_store.errors:
+                error_store.store_error(item_store.errors, index=index)
+            schemas.append(schema)
+            result.append(loaded)
+
+        return schemas, result
+
+    def _validate_polymorphic(self, data, originals, schemas, result,
+                              error_store, partial):
+        """ Run this schema's `pass_many` schema validators on the whole
+        collection, then each item's schema validators on its subclass
+        schema.
+        """
+        field_errors = bool(error_store.errors)
+        self._invoke_schema_validators(
+            error_store=error_store, pass_many=True, data=result,
+            original_data=data, many=True, partial=partial,
+            field_errors=field_errors)
+
+        for index, (schema, item, original) in enumerate(
+                zip(schemas, result, originals)):
+            if schema is None:
+                continue
+            item_store = ErrorStore()
+            schema._invoke_schema_validators(
+                error_store=item_store, pass_many=False, data=item,
+                original_data=original, many=False, partial=partial,
+                field_errors=field_errors)
+            if item_store.errors:
+                error_store.store_error(item_store.errors, index=index)
+
+    def build_cache_plan(self):
+        """ Hash everything that shapes this schema's output into a
+        string, so equally configured schemas share cache entries, even
+        across processes, and differently configured ones never do.
+        """
+        parts = [
+            _qualified_name(type(self)),
+            _qualified_name(self.sqlalchemy_cls),
+            self.snake_to_camel,
+            self.camel_to_snake,
+            self.new_obj,
+            self.version_col
+        ]
+        for name, field in sorted(self.dump_fields.items()):
+            parts.append((name, field.data_key, _field_signature(field)))
+
+        return sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def cache_key(self, obj):
+        """ Build the cache key for a SQLAlchemy object.
+
+        Returns None when the object can't be cached safely: it isn't a
+        SQLAlchemy instance (e.g. a plain dict), isn't persistent, has
+        unflushed changes or has no version.
+        """
+        state = inspect(obj, raiseerr=False)
+        if not isinstance(state, InstanceState):
+            return None
+        if state.key is None or state.modified:
+            return None
+
+        if self.version_col is not None:
+            version = getattr(obj, self.version_col, None)
+        else:
+            mapper = state.mapper
+            if mapper.version_id_col is None:
+                return None
+            prop = mapper.get_property_by_column(mapper.version_id_col)
+            version = getattr(obj, prop.key)
+
+        if version is None:
+            return None
+
+        # Identity keys hold the mapped class itself, so use its name to
+        # keep the key serializable for out-of-process backends
+        identity = state.key[1]
+        return '{}:{}:{!r}:{!r}'.format(
+            self.cache_plan, _qualified_name(state.key[0]),
+            tuple(identity), version)
+
+    def _serialize(self, obj, many=False):
+        """ Serialize `obj` with the schema for its mapped subclass if
+        this schema is polymorphic, reusing cached column values if a
+        cache is configured.
+
+        Only auto-generated column fields are cached; nested fields are
+        re-serialized every time (hitting their own schema's cache), as
+        are any manually declared fields, since their values aren't
+        covered by this object's version.
+        """
+        if many:
+            return super(GoldenSchema, self)._serialize(obj, many=many)
+
+        if self.polymorphic_schemas:
+            schema = self._polymorphic_classes.get(type(obj))
+            if schema is None:
+                schema = self._polymorphic_schema_for_class(obj)
+            if schema is not self:
+                # `context` may have been reassigned since construction
+                schema.context = self.context
+                return schema._serialize(obj)
+
+        if self.cache is None:
+            return super(GoldenSchema, self)._serialize(obj)
+
+        key = self.cache_key(obj)
+        if key is None:
+            return super(GoldenSchema, self)._serialize(obj)
+
+        # Copy on the way in and out so callers mutating JSON or ARRAY
+        # values can't corrupt the cache entry
+        cached = self.cache.get(key)
+        fresh = cached is None
+        cached = self.dict_class() if fresh else deepcopy(cached)
+
+        # Walk the fields in order so output matches the uncached path
+        ret = self.dict_class()
+        for attr_name, field_obj in self.dump_fields.items():
+            data_key = (field_obj.data_key if field_obj.data_key is not None
+                        else attr_name)
+            is_column = attr_name in self._column_names
+            if is_column and not fresh:
+                if data_key in cached:
+                    ret[data_key] = cached[data_key]
+                continue
+
+            value = field_obj.serialize(
+                attr_name, obj, accessor=self.get_attribute)
+            if value is missing:
+                continue
+            ret[data_key] = value
+            if is_column:
+                cached[data_key] = value
+
+        if fresh:
+            self.cache.set(key, deepcopy(cached))
+        return ret
 
     @post_load
     def make_sqlalchemy_object(self, data, **kwargs):
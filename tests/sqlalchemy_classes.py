@@ -1,4 +1,5 @@
-from sqlalchemy import Column, create_engine, ForeignKey, Integer, String
+from sqlalchemy import (
+    Column, create_engine, ForeignKey, Integer, JSON, String)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -48,4 +49,58 @@ class CamelFormula(Base):
     camelAttribute = Column(String)
 
 
+class Apothecary(Base):
+    __tablename__ = 'apothecaries'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    version_id = Column(Integer, nullable=False)
+    potions = relationship('Potion', backref='apothecary',
+                           cascade='all, delete, delete-orphan',
+                           single_parent=True)
+
+    __mapper_args__ = {'version_id_col': version_id}
+
+
+class Potion(Base):
+    __tablename__ = 'potions'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    revision = Column(Integer)
+    ingredients = Column(JSON)
+    apothecary_id = Column(Integer, ForeignKey('apothecaries.id'))
+
+
+class Spell(Base):
+    __tablename__ = 'spells'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    spell_type = Column(String)
+
+    __mapper_args__ = {
+        'polymorphic_on': spell_type,
+        'polymorphic_identity': 'spell'
+    }
+
+
+class Curse(Spell):
+    """ Joined-table inheritance """
+    __tablename__ = 'curses'
+    id = Column(Integer, ForeignKey('spells.id'), primary_key=True)
+    victim = Column(String)
+
+    __mapper_args__ = {'polymorphic_identity': 'curse'}
+
+
+class Charm(Spell):
+    """ Single-table inheritance """
+    duration = Column(Integer)
+
+    __mapper_args__ = {'polymorphic_identity': 'charm'}
+
+
+class SubCurse(Curse):
+    """ Mapped subclass without a polymorphic identity of its own """
+    pass
+
+
 Base.metadata.create_all(engine)
@@ -0,0 +1,92 @@
+from threading import Thread
+
+import pytest
+
+from golden_marshmallows.cache import CacheBackend, LRUCache
+
+
+class TestLRUCache:
+
+    def test_hits_and_misses(self):
+        cache = LRUCache()
+
+        assert cache.get('key') is None
+        cache.set('key', {'id': 1})
+        assert cache.get('key') == {'id': 1}
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+        assert stats['size'] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+
+    def test_stats_under_concurrent_access(self):
+        cache = LRUCache()
+        cache.set('a', 1)
+
+        def lookup():
+            for _ in range(1000):
+                cache.get('a')
+                cache.get('b')
+
+        threads = [Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.hits == 8000
+        assert cache.misses == 8000
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get('a') is None
+
+    def test_invalid_max_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
+
+    def test_custom_backend(self):
+
+        class DictCache(CacheBackend):
+            def __init__(self):
+                super(DictCache, self).__init__()
+                self.data = {}
+
+            def _get(self, key, default):
+                return self.data.get(key, default)
+
+            def set(self, key, value):
+                self.data[key] = value
+
+            def clear(self):
+                self.data.clear()
+
+            def __len__(self):
+                return len(self.data)
+
+        cache = DictCache()
+        cache.set('a', 1)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.stats() == {
+            'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'size': 1}
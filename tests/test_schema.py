@@ -1,9 +1,12 @@
 import pytest
-from marshmallow import fields
+from marshmallow import (
+    fields, post_load, pre_load, validates_schema, ValidationError)
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from .sqlalchemy_classes import (
-    Alchemist, CamelFormula, engine, Formula, WizardCollege)
+    Alchemist, Apothecary, CamelFormula, Charm, Curse, engine, Formula,
+    Potion, Spell, SubCurse, WizardCollege)
+from golden_marshmallows.cache import LRUCache
 from golden_marshmallows.schema import CaseChangingSchema, GoldenSchema
 
 
@@ -345,3 +348,314 @@ class TestGoldenSchema:
 
         assert ('Only one of snake_to_camel or camel_to_snake can be True' in
                 str(excinfo.value))
+
+
+class TestGoldenSchemaCache:
+
+    def setup_method(self):
+        self.session = scoped_session(sessionmaker(bind=engine))
+
+        self.apothecary = Apothecary(id=1, name='Flamel')
+        self.potion = Potion(id=1, name='elixir', revision=1,
+                             ingredients=['mercury'])
+        self.apothecary.potions.append(self.potion)
+
+        self.session.add(self.apothecary)
+        self.session.flush()
+
+        self.cache = LRUCache()
+        self.nested_map = {
+            'potions': {
+                'class': Potion,
+                'many': True,
+                'version_col': 'revision'
+            }
+        }
+
+    def teardown_method(self):
+        self.session.rollback()
+        self.session.close()
+
+    def test_repeated_dump_hits_cache(self):
+        gs = GoldenSchema(Apothecary, nested_map=self.nested_map,
+                          cache=self.cache)
+
+        first = gs.dump(self.apothecary)
+        second = gs.dump(self.apothecary)
+
+        assert first == second == {
+            'id': 1,
+            'name': 'Flamel',
+            'version_id': 1,
+            'potions': [
+                {
+                    'id': 1,
+                    'name': 'elixir',
+                    'revision': 1,
+                    'ingredients': ['mercury'],
+                    'apothecary_id': 1
+                }
+            ]
+        }
+        # One parent and one child miss, then one hit for each
+        assert self.cache.stats()['misses'] == 2
+        assert self.cache.stats()['hits'] == 2
+
+    def test_equivalent_schemas_share_entries(self):
+        for _ in range(3):
+            GoldenSchema(Apothecary, cache=self.cache).dump(self.apothecary)
+
+        assert self.cache.stats()['hits'] == 2
+        assert self.cache.stats()['size'] == 1
+
+    def test_cache_key_is_a_string(self):
+        gs = GoldenSchema(Apothecary, cache=self.cache)
+
+        key = gs.cache_key(self.apothecary)
+
+        assert isinstance(key, str)
+        assert key == GoldenSchema(Apothecary).cache_key(self.apothecary)
+
+    def test_version_change_invalidates(self):
+        gs = GoldenSchema(Apothecary, cache=self.cache)
+        gs.dump(self.apothecary)
+
+        self.apothecary.name = 'Nicolas Flamel'
+        self.session.flush()
+
+        assert self.apothecary.version_id == 2
+        assert gs.dump(self.apothecary)['name'] == 'Nicolas Flamel'
+        assert self.cache.stats()['hits'] == 0
+
+    def test_nested_change_without_parent_version_change(self):
+        gs = GoldenSchema(Apothecary, nested_map=self.nested_map,
+                          cache=self.cache)
+        gs.dump(self.apothecary)
+
+        self.potion.name = 'panacea'
+        self.potion.revision = 2
+        self.session.flush()
+
+        serialized = gs.dump(self.apothecary)
+
+        assert serialized['potions'][0]['name'] == 'panacea'
+
+    def test_unflushed_changes_bypass_cache(self):
+        gs = GoldenSchema(Apothecary, cache=self.cache)
+        gs.dump(self.apothecary)
+
+        self.apothecary.name = 'Perenelle'
+
+        assert gs.dump(self.apothecary)['name'] == 'Perenelle'
+        assert self.cache.stats()['hits'] == 0
+
+    def test_mutating_output_leaves_cache_untouched(self):
+        gs = GoldenSchema(Potion, cache=self.cache, version_col='revision')
+
+        gs.dump(self.potion)['ingredients'].append('lead')
+        cached = gs.dump(self.potion)
+        cached['ingredients'].append('salt')
+
+        assert gs.dump(self.potion)['ingredients'] == ['mercury']
+        assert self.cache.stats()['hits'] == 2
+
+    def test_cached_output_preserves_field_order(self):
+
+        class GoldenSubclass(GoldenSchema):
+            extra = fields.Function(lambda obj: 'extra value')
+
+            class Meta:
+                ordered = True
+
+        uncached = GoldenSubclass(Apothecary)
+        cached = GoldenSubclass(Apothecary, cache=self.cache)
+
+        expected = uncached.dump(self.apothecary)
+        miss = cached.dump(self.apothecary)
+        hit = cached.dump(self.apothecary)
+
+        assert list(miss.items()) == list(expected.items())
+        assert list(hit.items()) == list(expected.items())
+        assert self.cache.stats()['hits'] == 1
+
+    def test_non_instances_bypass_cache(self):
+        gs = GoldenSchema(Apothecary, cache=self.cache)
+
+        assert gs.dump(None) == {}
+        assert gs.dump({'id': 2, 'name': 'Paracelsus'}) == {
+            'id': 2, 'name': 'Paracelsus'}
+        assert len(self.cache) == 0
+
+    def test_unversioned_objects_not_cached(self):
+        gs = GoldenSchema(Potion, cache=self.cache)
+        gs.dump(self.potion)
+
+        assert len(self.cache) == 0
+
+    def test_error_on_unknown_version_col(self):
+        with pytest.raises(ValueError) as excinfo:
+            GoldenSchema(Apothecary, cache=self.cache, version_col='updatd_at')
+
+        assert ("Apothecary has no attribute 'updatd_at' to use as "
+                "version_col" in str(excinfo.value))
+
+    def test_error_on_unknown_nested_version_col(self):
+        self.nested_map['potions']['version_col'] = 'version_id'
+
+        with pytest.raises(ValueError):
+            GoldenSchema(Apothecary, nested_map=self.nested_map,
+                         cache=self.cache)
+
+    def test_inherited_version_col_skips_classes_without_it(self):
+        del self.nested_map['potions']['version_col']
+
+        parent = GoldenSchema(Apothecary, nested_map=self.nested_map,
+                              cache=self.cache, version_col='version_id')
+
+        assert parent.fields['potions'].schema.version_col is None
+
+    def test_schemas_do_not_share_entries(self):
+        plain = GoldenSchema(Apothecary, cache=self.cache)
+        camel = GoldenSchema(Apothecary, cache=self.cache,
+                             snake_to_camel=True)
+
+        plain.dump(self.apothecary)
+
+        assert 'versionId' in camel.dump(self.apothecary)
+
+
+class TestGoldenSchemaPolymorphic:
+
+    def setup_method(self):
+        self.spells = [
+            Spell(id=1, name='lumos'),
+            Curse(id=2, name='hex', victim='Malfoy'),
+            Charm(id=3, name='shield', duration=10)
+        ]
+
+        self.serialized = [
+            {'id': 1, 'name': 'lumos', 'spell_type': 'spell'},
+            {'id': 2, 'name': 'hex', 'spell_type': 'curse',
+             'victim': 'Malfoy'},
+            {'id': 3, 'name': 'shield', 'spell_type': 'charm',
+             'duration': 10}
+        ]
+
+    def test_dump_mixed_collection(self):
+        gs = GoldenSchema(Spell, polymorphic=True, many=True)
+
+        assert gs.dump(self.spells) == self.serialized
+
+    def test_dump_falls_back_to_nearest_ancestor(self):
+        gs = GoldenSchema(Spell, polymorphic=True)
+
+        serialized = gs.dump(SubCurse(id=4, name='jinx', victim='Goyle'))
+
+        assert serialized['victim'] == 'Goyle'
+        assert gs._polymorphic_classes[SubCurse] is \
+            gs.polymorphic_schemas['curse']
+
+    def test_non_polymorphic_dump_drops_subclass_columns(self):
+        gs = GoldenSchema(Spell, many=True)
+
+        assert 'victim' not in gs.dump(self.spells)[1]
+
+    def test_load_mixed_collection(self):
+        gs = GoldenSchema(Spell, polymorphic=True, many=True)
+
+        spells = gs.load(self.serialized)
+
+        assert [type(spell) for spell in spells] == [Spell, Curse, Charm]
+        assert spells[1].victim == 'Malfoy'
+        assert spells[2].duration == 10
+
+    def test_subclass_schemas_share_settings(self):
+
+        class ContextSchema(GoldenSchema):
+            realm = fields.Method('get_realm')
+
+            def get_realm(self, obj):
+                return self.context.get('realm')
+
+        gs = ContextSchema(Spell, polymorphic=True, many=True,
+                           dump_only=('name',))
+        gs.context = {'realm': 'Bogwarts'}
+
+        serialized = gs.dump(self.spells)
+
+        assert [item['realm'] for item in serialized] == ['Bogwarts'] * 3
+        assert gs.polymorphic_schemas['curse'].dump_only == {'name'}
+        assert gs.polymorphic_schemas['curse'].many is False
+
+    def test_load_snake_to_camel(self):
+        gs = GoldenSchema(Spell, polymorphic=True, snake_to_camel=True)
+
+        curse = gs.load({'id': 2, 'spellType': 'curse', 'victim': 'Malfoy'})
+
+        assert isinstance(curse, Curse)
+        assert gs.dump(curse)['spellType'] == 'curse'
+
+    def test_load_unknown_identity(self):
+        gs = GoldenSchema(Spell, polymorphic=True, many=True)
+
+        with pytest.raises(ValidationError) as excinfo:
+            gs.load([self.serialized[0], {'id': 4, 'spell_type': 'jinx'}])
+
+        assert excinfo.value.messages == {
+            1: {'spell_type': ["Unknown polymorphic identity: 'jinx'"]}}
+
+    def test_validate_checks_subclass_fields(self):
+        gs = GoldenSchema(Spell, polymorphic=True, many=True)
+
+        errors = gs.validate([{'spell_type': 'curse', 'victim': 123}])
+
+        assert errors == {0: {'victim': ['Not a valid string.']}}
+
+    def test_load_many_runs_pass_many_hooks(self):
+
+        class EnvelopeSchema(GoldenSchema):
+
+            @pre_load(pass_many=True)
+            def unwrap(self, data, many, **kwargs):
+                return data['items'] if many else data
+
+            @validates_schema(pass_many=True)
+            def check_count(self, data, many, **kwargs):
+                if many and len(data) > 3:
+                    raise ValidationError('Too many spells.')
+
+            @post_load(pass_many=True)
+            def drop_lumos(self, data, many, **kwargs):
+                if not many:
+                    return data
+                return [item for item in data if item['name'] != 'lumos']
+
+        gs = EnvelopeSchema(Spell, polymorphic=True, many=True)
+
+        spells = gs.load({'items': self.serialized})
+
+        assert [type(spell) for spell in spells] == [Curse, Charm]
+        assert gs.validate({'items': self.serialized}) == {}
+        assert gs.validate({'items': self.serialized * 2}) == {
+            '_schema': ['Too many spells.']}
+
+    def test_load_many_rejects_non_collection(self):
+        gs = GoldenSchema(Spell, polymorphic=True, many=True)
+
+        with pytest.raises(ValidationError) as excinfo:
+            gs.load(self.serialized[0])
+
+        assert excinfo.value.messages == {'_schema': ['Invalid input type.']}
+
+    def test_dispatch_table_limited_to_subclasses(self):
+        gs = GoldenSchema(Spell, polymorphic=True)
+        curse_gs = GoldenSchema(Curse, polymorphic=True)
+
+        assert set(gs.polymorphic_schemas) == {'spell', 'curse', 'charm'}
+        assert set(curse_gs.polymorphic_schemas) == {'curse'}
+
+    def test_error_when_not_polymorphic(self):
+        with pytest.raises(ValueError) as excinfo:
+            GoldenSchema(Formula, polymorphic=True)
+
+        assert 'Formula is not mapped polymorphically' in str(excinfo.value)